@@ -10,9 +10,21 @@ Run: python3 trig_plot.py
 Output: trig_functions.png (150 DPI)
 """
 
+import matplotlib
+matplotlib.use('Agg')  # the script only writes files, so skip GUI backend setup
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; fall back to plain numpy
+    ne = None
+
+# Let Agg drop sub-pixel line detail and draw long paths in chunks
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
 # Option 1: Use data from Wolfram Language
 # (In practice, you would parse the Wolfram output)
 # Option 2: Regenerate with numpy (shown here)
@@ -22,7 +34,12 @@ def generate_data():
     x = np.linspace(0, 2*np.pi, 100)
     sin_x = np.sin(x)
     cos_x = np.cos(x)
-    product = sin_x * cos_x
+    # Sin(x)·Cos(x) = ½·Sin(2x): a single sine instead of sin, cos and a multiply
+    if ne is not None:
+        product = ne.evaluate("0.5 * sin(2.0 * x)")
+    else:
+        product = np.sin(2.0 * x)
+        product *= 0.5
     return x, sin_x, cos_x, product
 
 def create_plot():
@@ -53,9 +70,11 @@ def create_plot():
     ax1.set_xticklabels(pi_labels)
     
     # Bottom plot: Product function with shaded areas
-    ax2.fill_between(x, 0, product, where=(product >= 0), 
+    # One comparison; its negation covers exactly the rest of the domain
+    positive = product >= 0
+    ax2.fill_between(x, 0, product, where=positive, 
                      color='purple', alpha=0.3, label='Positive region')
-    ax2.fill_between(x, 0, product, where=(product < 0), 
+    ax2.fill_between(x, 0, product, where=~positive, 
                      color='orange', alpha=0.3, label='Negative region')
     ax2.plot(x, product, 'purple', linewidth=2)
     ax2.axhline(y=0, color='k', linestyle='-', alpha=0.5)
@@ -83,14 +102,19 @@ def main():
     
     fig = create_plot()
     
+    # Lay the figure out once (without rasterizing it) and share its tight
+    # bounding box between both formats, so neither savefig measures it again
+    fig.draw_without_rendering()
+    bbox = fig.get_tightbbox().padded(plt.rcParams['savefig.pad_inches'])
+    
     # Save with high resolution
     output_file = 'trig_functions.png'
-    fig.savefig(output_file, dpi=150, bbox_inches='tight')
+    fig.savefig(output_file, dpi=150, bbox_inches=bbox)
     print(f"✓ Plot saved as: {output_file}")
     
     # Optionally, also save as PDF for publications
     pdf_file = 'trig_functions.pdf'
-    fig.savefig(pdf_file, bbox_inches='tight')
+    fig.savefig(pdf_file, bbox_inches=bbox)
     print(f"✓ PDF saved as: {pdf_file}")
     
     print("\nPlot characteristics:")
@@ -0,0 +1,449 @@
+"""
+Unit tests for the parts of wolfram_mcp_server that run without a Wolfram kernel
+
+Run: python -m pytest tests
+"""
+
+import io
+import sys
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import wolfram_mcp_server as server
+
+
+@pytest.mark.parametrize("value, expected", [
+    (3, "3"),
+    (-3, "-3"),
+    (Fraction(3, 2), "3/2"),
+    (Fraction(-1, 3), "-1/3"),
+    (Fraction(4, 2), "2"),
+    (2.0, "2."),
+    (0.1, "0.1"),
+    (1e-5, "1.*^-5"),
+    (1.5e20, "1.5*^20"),
+    (123456.0, "123456."),
+    (1234567.0, "1.234567*^6"),
+    (1e6, "1.*^6"),
+    (-2.5e7, "-2.5*^7"),
+    (9999999999999998.0, "9.999999999999998*^15"),
+])
+def test_format_number(value, expected):
+    assert server._format_number(value) == expected
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("42", 42),
+    (" -7 ", -7),
+    ("2.5", 2.5),
+    ("3.", 3.0),
+    (".5", 0.5),
+    ("123456789.012345", 123456789.012345),
+    ("0.000123456789012345", 0.000123456789012345),
+])
+def test_parse_number(token, expected):
+    value = server._parse_number(token)
+    assert value == expected
+    assert type(value) is type(expected)
+
+
+@pytest.mark.parametrize("token", ["1e5", "x", "1/2", "", "2 3", "1.234567890123456789012"])
+def test_parse_number_rejects_non_literals(token):
+    with pytest.raises(ValueError):
+        server._parse_number(token)
+
+
+@pytest.mark.parametrize("operation, data, expected", [
+    ("Mean", "{1, 2}", "3/2"),
+    ("Mean", "{1, 2, 3}", "2"),
+    ("Median", "{4, 1, 3, 2}", "5/2"),
+    ("Median", "{3, 1, 2}", "2"),
+    ("Variance", "{1, 2, 3, 4}", "5/3"),
+    ("Max", "{1, 7, 3}", "7"),
+    ("Min", "{1, 7, -3}", "-3"),
+    ("Mean", "{1, 2.5}", "1.75"),
+    ("StandardDeviation", "{1., 2., 3.}", "1."),
+    ("Variance", "{1., 2., 3.}", "1."),
+])
+def test_local_statistics(operation, data, expected):
+    assert server._local_statistics(operation, data) == expected
+
+
+@pytest.mark.parametrize("operation, data", [
+    ("StandardDeviation", "{1, 2, 3}"),  # exact square root
+    ("Mean", "{a, b}"),
+    ("Mean", "{1e5}"),
+    ("Mean", "{}"),
+    ("Mean", "1, 2"),
+    ("Variance", "{5}"),
+    ("Skewness", "{1, 2}"),
+    ("Mean", "{1.234567890123456789012, 2}"),  # arbitrary-precision real
+    ("mean", "{1, 2}"),  # not a Wolfram symbol; the kernel leaves it unevaluated
+    ("MEAN", "{1, 2}"),
+])
+def test_local_statistics_defers_to_kernel(operation, data):
+    assert server._local_statistics(operation, data) is None
+
+
+def test_parse_matrix():
+    assert server._parse_matrix(" {{1, 2}, {3., 4}} ") == [[1, 2], [3.0, 4]]
+
+
+@pytest.mark.parametrize("data", ["{{1, 2}, {3}}", "{{1, x}, {3, 4}}", "{1, 2}", "{{1, 2}"])
+def test_parse_matrix_rejects(data):
+    assert server._parse_matrix(data) is None
+
+
+def test_exact_det():
+    assert server._exact_det([[1, 2], [3, 4]]) == -2
+    # Needs a row swap for the first pivot
+    assert server._exact_det([[0, 1], [1, 0]]) == -1
+    assert server._exact_det([[1, 2], [2, 4]]) == 0
+
+
+def test_exact_inverse():
+    assert server._exact_inverse([[1, 2], [3, 4]]) == [
+        [Fraction(-2), Fraction(1)], [Fraction(3, 2), Fraction(-1, 2)]
+    ]
+    assert server._exact_inverse([[0, 1], [1, 0]]) == [[0, 1], [1, 0]]
+    assert server._exact_inverse([[1, 2], [2, 4]]) is None
+
+
+@pytest.mark.parametrize("operation, data, expected", [
+    ("Inverse", "{{1, 2}, {3, 4}}", "{{-2, 1}, {3/2, -1/2}}"),
+    ("Det", "{{1, 2}, {3, 4}}", "-2"),
+    ("Det", "{{1, 2}, {2, 4}}", "0"),
+    ("Transpose", "{{1, 2, 3}, {4, 5, 6}}", "{{1, 4}, {2, 5}, {3, 6}}"),
+    ("Inverse", "{{2., 0.}, {0., 4.}}", "{{0.5, 0.}, {0., 0.25}}"),
+    ("Eigenvalues", "{{2., 0.}, {0., 5.}}", "{5., 2.}"),
+    ("Eigenvectors", "{{2., 0.}, {0., 5.}}", "{{0., 1.}, {1., 0.}}"),
+    ("Eigenvalues", "{{0., -1.}, {1., 0.}}", "{0. + 1.*I, 0. - 1.*I}"),
+])
+def test_local_matrix_operation(operation, data, expected):
+    assert server._local_matrix_operation(operation, data) == expected
+
+
+@pytest.mark.parametrize("operation, data", [
+    ("Inverse", "{{1, 2}, {2, 4}}"),  # singular, exact
+    ("Inverse", "{{1., 2.}, {2., 4.}}"),  # singular, machine reals
+    ("Inverse", "{{1, 2}, {3}}"),  # ragged rows
+    ("Transpose", "{{1, 2}, {3}}"),
+    ("Det", "{{1, 2, 3}, {4, 5, 6}}"),  # not square
+    ("Det", "{{a, b}, {c, d}}"),
+    ("Eigenvalues", "{{1, 0}, {0, 2}}"),  # exact eigenvalues
+    ("MatrixRank", "{{1., 2.}, {3., 4.}}"),
+])
+def test_local_matrix_operation_defers_to_kernel(operation, data):
+    assert server._local_matrix_operation(operation, data) is None
+
+
+@pytest.mark.parametrize("code", [
+    "f[x_] := x^2",
+    "a = 3",
+    "x++",
+    "Clear[f]",
+    "RandomReal[]",
+    "SeedRandom[42]",
+    "Now",
+    "$Version",
+    "Export[\"a.png\", p]",
+    "Get[\"init.m\"]",
+    "AppendTo[lst, 1]",
+    "PrependTo[lst, 1]",
+    "AddTo[x, 1]",
+    "Protect[f]",
+    "DeleteFile[\"a.txt\"]",
+    "CopyFile[\"a\", \"b\"]",
+    "CreateFile[]",
+    "FileNames[]",
+    "MemoryInUse[]",
+    "Module[{x}, x]",
+    "Unique[]",
+    "WolframAlpha[\"weather\"]",
+])
+def test_uncacheable(code):
+    assert server._UNCACHEABLE.search(code)
+
+
+@pytest.mark.parametrize("code", [
+    "f[3]",
+    "Integrate[x^2, x]",
+    "Solve[x^2 == 4, x]",
+    "a != b",
+    "x <= 2",
+    "MyRandomness[2]",
+])
+def test_cacheable(code):
+    assert not server._UNCACHEABLE.search(code)
+
+
+class _FakeExecutor:
+    """Stands in for a persistent kernel that understands f[x_] := x^n and f[x]"""
+    
+    executable = "fake"
+    generation = 0
+    
+    def __init__(self):
+        self.power = None
+        self.calls = 0
+    
+    def execute(self, code, timeout=30, max_output=None):
+        self.calls += 1
+        if code.startswith("f[x_] := x^"):
+            self.power = int(code.rsplit("^", 1)[1])
+            return {"success": True, "result": "Null"}
+        if code.startswith("f["):
+            x = int(code[2:-1])
+            return {"success": True, "result": str(x ** self.power)}
+        return {"success": True, "result": code}
+    
+    def execute_many(self, codes, timeout=30, max_output=None):
+        return {"success": True, "results": [self.execute(code)["result"] for code in codes]}
+    
+    def close(self):
+        pass
+
+
+def _make_fake_pool(size):
+    pool = server.WolframKernelPool(size)
+    pool._executors = [_FakeExecutor() for _ in range(size)]
+    pool._primary = pool._executors[0]
+    pool._idle = server.queue.LifoQueue()
+    for executor in reversed(pool._executors):
+        pool._idle.put(executor)
+    return pool
+
+
+@pytest.fixture
+def fake_pool():
+    pool = _make_fake_pool(1)
+    yield pool
+    pool.close()
+
+
+def test_pool_caches_repeated_expressions(fake_pool):
+    fake_pool.execute("f[x_] := x^2")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    assert fake_pool._executors[0].calls == 2
+
+
+def test_pool_redefinition_clears_cache(fake_pool):
+    fake_pool.execute("f[x_] := x^2")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    fake_pool.execute("f[x_] := x^3")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "27"
+
+
+def test_pool_batch_definition_clears_cache(fake_pool):
+    fake_pool.execute("f[x_] := x^2")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    server.asyncio.run(fake_pool.run_many(["f[x_] := x^3"]))
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "27"
+
+
+def test_pool_runs_definitions_and_pinned_code_on_primary():
+    pool = _make_fake_pool(2)
+    primary, other = pool._executors
+    try:
+        # Keep the primary busy so get() hands out the other executor
+        assert pool.get() is primary
+        pool.execute("f[x_] := x^2")
+        pool.execute("g[1]", pinned=True)
+        assert (primary.calls, primary.power, other.calls) == (2, 2, 0)
+    finally:
+        pool.put(primary)
+        pool.close()
+
+
+def test_pool_caches_only_primary_results():
+    pool = _make_fake_pool(2)
+    primary, other = pool._executors
+    try:
+        assert pool.get() is primary
+        pool.execute("Integrate[x, x]", cache=True)
+        pool.execute("Integrate[x, x]", cache=True)
+        assert other.calls == 2
+        pool.put(primary)
+        pool.execute("Integrate[x, x]", cache=True)
+        pool.execute("Integrate[x, x]", cache=True)
+        assert primary.calls == 1
+    finally:
+        pool.close()
+
+
+def test_pool_caches_only_when_asked(fake_pool):
+    fake_pool.execute("Integrate[x, x]")
+    fake_pool.execute("Integrate[x, x]")
+    assert fake_pool._executors[0].calls == 2
+
+
+def test_pool_pinned_call_clears_cache(fake_pool):
+    fake_pool.execute("f[x_] := x^2")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    fake_pool._executors[0].power = 3  # as if changed by code the pattern can't see
+    fake_pool.execute("g[1]", pinned=True)
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "27"
+
+
+def test_pool_kernel_restart_clears_cache(fake_pool):
+    fake_pool.execute("f[x_] := x^2")
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "9"
+    primary = fake_pool._executors[0]
+    primary.generation += 1
+    primary.power = 3
+    assert fake_pool.execute("f[3]", cache=True)["result"] == "27"
+
+
+def test_pool_reuses_most_recent_executor():
+    pool = server.WolframKernelPool(3)
+    try:
+        used = set()
+        for _ in range(5):
+            executor = pool.get()
+            used.add(id(executor))
+            pool.put(executor)
+        assert len(used) == 1
+    finally:
+        pool.close()
+
+
+def test_output_buffer_truncates():
+    buffer = server._OutputBuffer(5)
+    buffer.append("abc")
+    buffer.append("defgh")
+    buffer.append("ijk")
+    assert buffer.truncated
+    assert buffer.getvalue() == "abcde\n... [output truncated after 5 characters]"
+
+
+def test_drain_chunks_bounds_a_single_long_line():
+    buffer = server._OutputBuffer(10)
+    server._drain_chunks(io.StringIO("x" * 100_000), buffer, chunk_size=1000)
+    assert buffer.truncated
+    assert buffer._size == 10
+
+
+def test_execute_script_streams_into_bounded_buffer():
+    # python -c takes code the same way wolframscript -c does
+    executor = server.WolframExecutor(use_kernel=False)
+    executor.executable = sys.executable
+    result = executor.execute("print('x' * 100000)", max_output=10)
+    assert result["success"]
+    assert result["result"] == "x" * 10 + "\n... [output truncated after 10 characters]"
+
+
+@pytest.mark.parametrize("expr", [
+    "Solve[x^2 == 4, x]",
+    "{{1, 2}, {3, 4}}",
+    'StringJoin["(", "]"]',
+    r'"a \" ]"',
+    "x^2 (* ( *)",
+    "f[x] (* outer (* inner ] *) still comment ) *)",
+    "(*)*) x",
+    "",
+])
+def test_balanced(expr):
+    assert server._balanced(expr)
+
+
+@pytest.mark.parametrize("expr", [
+    "Solve[x^2 == 4, x",
+    "f[x)",
+    "{1, 2}}",
+    '"unterminated',
+    "x (* open comment",
+    "x (* (* *)",
+    "x *) [",
+])
+def test_unbalanced(expr):
+    assert not server._balanced(expr)
+
+
+def test_check_balanced_names_first_bad_argument():
+    assert server._check_balanced("x^2", "y]") == "Error: Unbalanced brackets or quotes in 'y]'"
+    assert server._check_balanced("x^2", "y") is None
+
+
+_STUB_KERNEL = f"""#!/bin/sh
+exec {sys.executable} -c '
+import sys
+stdin = open(0, encoding="utf-8")
+stdout = open(1, "w", encoding="utf-8")
+print("Stub kernel banner", file=stdout, flush=True)
+for line in stdin:
+    if line.startswith("Quit"):
+        break
+    print("echo:" + line.strip(), file=stdout)
+    print("{server.RESULT_SENTINEL}", file=stdout, flush=True)
+'
+"""
+
+
+@pytest.fixture
+def stub_kernel(tmp_path):
+    """Executor whose persistent kernel echoes each request line back"""
+    path = tmp_path / "kernel"
+    path.write_text(_STUB_KERNEL)
+    path.chmod(0o755)
+    executor = server.WolframExecutor()
+    executor.executable = str(path)
+    yield executor
+    executor.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub kernel is a shell script")
+def test_kernel_skips_banner_and_keeps_session(stub_kernel):
+    first = stub_kernel.execute("1 + 1")
+    assert first["success"]
+    assert first["result"].startswith("echo:WriteString[$Output,")
+    process = stub_kernel._process
+    assert stub_kernel.execute("2 + 2")["success"]
+    assert stub_kernel._process is process
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub kernel is a shell script")
+def test_kernel_pipes_are_utf8(stub_kernel):
+    result = stub_kernel.execute("Sin[π/2] + Boole[x ≤ 2]")
+    assert result["success"]
+    assert "Sin[π/2] + Boole[x ≤ 2]" in result["result"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub kernel is a shell script")
+def test_kernel_request_survives_abort(stub_kernel):
+    request = stub_kernel.execute("Abort[]")["result"]
+    assert 'CheckAbort[' + server.FORMAT_RESULT + '[ToExpression["Abort[]"]]' in request
+    assert request.endswith(', "$Aborted"], "\\n<<WOLFRAM_MCP_END>>\\n"];')
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub kernel is a shell script")
+def test_kernel_batch_formats_graphics_and_caps_output(stub_kernel):
+    request = stub_kernel.execute_many(["Plot[x, {x, 0, 1}]"], max_output=1000)["result"]
+    assert request.startswith("echo:WriteString[$Output, StringTake[CheckAbort[StringRiffle[Map["
+                              + server.FORMAT_RESULT)
+    assert "UpTo[1001]]" in request
+
+
+def test_statistics_accepts_pure_function_operation(fake_pool, monkeypatch):
+    monkeypatch.setattr(server, "pool", fake_pool)
+    result = server.asyncio.run(server.wolfram_statistics("Quantile[#, 0.9] &", "{1, 2, 3}"))
+    assert result == "Quantile[#, 0.9] &: Quantile[#, 0.9] &[{1, 2, 3}]"
+
+
+def test_statistics_rejects_unbalanced_operation(fake_pool, monkeypatch):
+    monkeypatch.setattr(server, "pool", fake_pool)
+    result = server.asyncio.run(server.wolfram_statistics("Quantile[#, 0.9 &", "{1, 2, 3}"))
+    assert result.startswith("Error: Unbalanced brackets")
+    assert fake_pool._executors[0].calls == 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stub kernel is a shell script")
+def test_kernel_stop_advances_generation(stub_kernel):
+    assert stub_kernel.generation == 0
+    stub_kernel.execute("1 + 1")
+    stub_kernel._stop_kernel(graceful=False)
+    assert stub_kernel.generation == 1
@@ -3,12 +3,22 @@ Wolfram Language MCP Server
 Provides computational tools via Wolfram Language/Mathematica integration
 """
 
+import asyncio
+import atexit
+import functools
+import queue
 import subprocess
+import threading
+import time
 import json
+import re
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
+import numpy as np
 from fastmcp import FastMCP
 
 # Initialize MCP server
@@ -16,67 +26,761 @@ mcp = FastMCP("Wolfram Language")
 
 # Configuration
 WOLFRAM_SCRIPT_PATH = r"C:\Program Files\Wolfram Research\Mathematica\14.0\wolframscript.exe"
-MATH_KERNEL_PATH = r"C:\Program Files\Wolfram Research\Mathematica\14.0\MathKernel.exe"
+# Console kernel for the persistent session; MathKernel.exe opens its own window on Windows
+MATH_KERNEL_PATH = r"C:\Program Files\Wolfram Research\Mathematica\14.0\wolfram.exe"
+
+# Output limit for tools whose results are normally short (1 MB of text)
+MAX_TOOL_OUTPUT = 1_000_000
+
+# Printed after each kernel evaluation to mark the end of its output
+RESULT_SENTINEL = "<<WOLFRAM_MCP_END>>"
+# Separates the results of a batched evaluation
+BATCH_DELIMITER = "<<WOLFRAM_MCP_NEXT>>"
+# Formats a result as text: graphics print as -Graphics- (as WolframScript
+# shows them) rather than as the full InputForm of the graphics object
+FORMAT_RESULT = (
+    "(If[MatchQ[#, _Graphics | _Graphics3D | _Image], ToString[#], ToString[#, InputForm]] &)"
+)
 
 class WolframExecutor:
-    """Handles execution of Wolfram Language code"""
+    """Handles execution of Wolfram Language code
+
+    In kernel mode a single console kernel process is started on first use and kept
+    alive between calls, so kernel startup is paid once rather than per evaluation.
+    """
     
-    def __init__(self, use_kernel: bool = False):
+    def __init__(self, use_kernel: bool = True):
         self.executable = MATH_KERNEL_PATH if use_kernel else WOLFRAM_SCRIPT_PATH
         self.use_kernel = use_kernel
+        self._process: Optional[subprocess.Popen] = None
+        # Counts kernel shutdowns; each one loses every definition made so far
+        self.generation = 0
+        self._lines: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
     
-    def execute(self, code: str, timeout: int = 30) -> Dict[str, Any]:
+    def execute(self, code: str, timeout: int = 30, max_output: Optional[int] = None) -> Dict[str, Any]:
         """
         Execute Wolfram Language code and return results
         
         Args:
             code: Wolfram Language code to execute
             timeout: Execution timeout in seconds
+            max_output: Keep at most this many characters of output (None for no limit)
             
         Returns:
             Dictionary with 'success', 'result', and optional 'error'
         """
+        if not self.use_kernel:
+            return self._execute_script(code, timeout, max_output)
+        
+        return self._execute_string(
+            f"{FORMAT_RESULT}[ToExpression[{_to_wolfram_string(code)}]]", timeout, max_output
+        )
+    
+    def execute_many(self, codes: List[str], timeout: int = 30,
+                     max_output: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Execute several Wolfram Language expressions in a single round-trip
+        
+        Args:
+            codes: Wolfram Language expressions, evaluated in order
+            timeout: Execution timeout in seconds for the whole batch
+            max_output: Keep at most this many characters of output for the whole batch
+            
+        Returns:
+            Dictionary with 'success', 'results' (one string per expression), and optional 'error'
+        """
+        held = ", ".join(_to_wolfram_string(code) for code in codes)
+        return self._execute_list(f"Map[ToExpression, {{{held}}}]", timeout, max_output)
+    
+    def execute_chain(self, expression: str, operations: List[str], timeout: int = 30,
+                      max_output: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply operations to an expression one after another in a single round-trip
+        
+        Args:
+            expression: Starting Wolfram Language expression
+            operations: Function heads or pure functions, e.g. "Simplify" or "Solve[#, x] &"
+            timeout: Execution timeout in seconds for the whole chain
+            max_output: Keep at most this many characters of output for the whole chain
+            
+        Returns:
+            Dictionary with 'success', 'results' (the value after each operation), and optional 'error'
+        """
+        held = ", ".join(_to_wolfram_string(operation) for operation in operations)
+        return self._execute_list(
+            f"Rest[ComposeList[Map[ToExpression, {{{held}}}], "
+            f"ToExpression[{_to_wolfram_string(expression)}]]]",
+            timeout, max_output
+        )
+    
+    def close(self) -> None:
+        """Shut down the persistent kernel, if one is running"""
+        with self._lock:
+            self._stop_kernel()
+    
+    def __del__(self):
         try:
-            result = subprocess.run(
-                [self.executable, "-c", code],
-                stdin=subprocess.DEVNULL,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+            self._stop_kernel()
+        except Exception:
+            pass
+    
+    def _execute_list(self, list_code: str, timeout: int,
+                      max_output: Optional[int] = None) -> Dict[str, Any]:
+        """Evaluate code yielding a list and split the output into one string per element"""
+        result = self._execute_string(
+            f"StringRiffle[Map[{FORMAT_RESULT}, {list_code}], "
+            f"\"\\n{BATCH_DELIMITER}\\n\"]",
+            timeout, max_output
+        )
+        if result["success"]:
+            result["results"] = [part.strip() for part in result["result"].split(BATCH_DELIMITER)]
+        return result
+    
+    def _execute_string(self, string_code: str, timeout: int,
+                        max_output: Optional[int] = None) -> Dict[str, Any]:
+        """Evaluate code whose value is a String and return that string as the result"""
+        if not self.use_kernel:
+            return self._execute_script(string_code, timeout, max_output)
+        
+        with self._lock:
+            return self._execute_kernel(string_code, timeout, max_output)
+    
+    def _execute_kernel(self, string_code: str, timeout: int,
+                        max_output: Optional[int]) -> Dict[str, Any]:
+        try:
+            if self._process is None or self._process.poll() is not None:
+                self._start_kernel(timeout)
+            
+            # An abort in the user's code would otherwise skip the WriteString below,
+            # leaving the call to wait out its timeout without a sentinel
+            string_code = f"CheckAbort[{string_code}, \"$Aborted\"]"
+            if max_output is not None:
+                # The result arrives as a single line, so cut it down in the kernel
+                # rather than hold all of it here; one extra character still lets
+                # _OutputBuffer see that it was truncated
+                string_code = f"StringTake[{string_code}, UpTo[{max_output + 1}]]"
             
-            if result.returncode == 0:
-                output = result.stdout.strip()
+            # Keep the request on one input line and mark the end of its output
+            self._process.stdin.write(
+                f"WriteString[$Output, {string_code}, \"\\n{RESULT_SENTINEL}\\n\"];\n"
+            )
+            self._process.stdin.flush()
+        except Exception as e:
+            self._stop_kernel(graceful=False)
+            return {
+                "success": False,
+                "error": f"Execution error: {str(e)}"
+            }
+        
+        output = _OutputBuffer(max_output)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                # The kernel is still busy; restart it rather than read stale output later
+                self._stop_kernel(graceful=False)
                 return {
-                    "success": True,
-                    "result": output,
-                    "raw_output": result.stdout,
-                    "stderr": result.stderr
+                    "success": False,
+                    "error": f"Execution timed out after {timeout} seconds"
                 }
-            else:
+            
+            if line is None:
+                self._stop_kernel(graceful=False)
                 return {
                     "success": False,
-                    "error": f"Execution failed with code {result.returncode}",
-                    "stderr": result.stderr,
-                    "stdout": result.stdout
+                    "error": "Kernel exited unexpectedly",
+                    "stdout": output.getvalue()
                 }
-                    
+            if line.rstrip("\r\n") == RESULT_SENTINEL:
+                break
+            # Past the limit, lines are still read up to the sentinel but dropped
+            output.append(line)
+        
+        raw_output = output.getvalue()
+        return {
+            "success": True,
+            "result": raw_output.strip(),
+            "raw_output": raw_output,
+            "stderr": ""
+        }
+    
+    def _execute_script(self, code: str, timeout: int,
+                        max_output: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            process = subprocess.Popen(
+                [self.executable, "-c", code],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Execution error: {str(e)}"
+            }
+        
+        # Stream both pipes into bounded buffers instead of holding all output
+        stdout = _OutputBuffer(max_output)
+        stderr = _OutputBuffer(max_output)
+        readers = [
+            threading.Thread(target=_drain_chunks, args=(process.stdout, stdout), daemon=True),
+            threading.Thread(target=_drain_chunks, args=(process.stderr, stderr), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        try:
+            returncode = process.wait(timeout=timeout)
         except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
             return {
                 "success": False,
                 "error": f"Execution timed out after {timeout} seconds"
             }
-        except Exception as e:
+        for reader in readers:
+            reader.join()
+        
+        if returncode == 0:
+            raw_output = stdout.getvalue()
+            return {
+                "success": True,
+                "result": raw_output.strip(),
+                "raw_output": raw_output,
+                "stderr": stderr.getvalue()
+            }
+        else:
             return {
                 "success": False,
-                "error": f"Execution error: {str(e)}"
+                "error": f"Execution failed with code {returncode}",
+                "stderr": stderr.getvalue(),
+                "stdout": stdout.getvalue()
             }
+    
+    def _start_kernel(self, timeout: int) -> None:
+        self._process = subprocess.Popen(
+            [self.executable, "-noinit", "-noprompt"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        # Pipes can't be select()ed on Windows, so a reader thread feeds a queue
+        # that execute() waits on with a timeout
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=_pump_lines,
+            args=(self._process.stdout, self._lines),
+            daemon=True
+        ).start()
+        
+        # Talk UTF-8 both ways (the pipes would otherwise use the locale codec),
+        # don't keep every request in In[n]/Out[n] for the life of the session, and
+        # wait for the kernel to answer so any startup banner is not read as a result
+        self._process.stdin.write(
+            f"$CharacterEncoding = \"UTF-8\"; $HistoryLength = 0; "
+            f"WriteString[$Output, \"{RESULT_SENTINEL}\\n\"];\n"
+        )
+        self._process.stdin.flush()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise RuntimeError(f"Kernel did not start within {timeout} seconds")
+            if line is None:
+                raise RuntimeError(f"Kernel exited during startup: {self.executable}")
+            if line.rstrip("\r\n") == RESULT_SENTINEL:
+                return
+    
+    def _stop_kernel(self, graceful: bool = True) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        self.generation += 1
+        
+        if graceful and process.poll() is None:
+            try:
+                process.stdin.write("Quit[]\n")
+                process.stdin.flush()
+                process.wait(timeout=5)
+            except Exception:
+                pass
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+def _to_wolfram_string(code: str) -> str:
+    """Quote code as a Wolfram Language string literal"""
+    escaped = (code.replace("\\", "\\\\")
+                   .replace('"', '\\"')
+                   .replace("\r", "")
+                   .replace("\n", "\\n"))
+    return f'"{escaped}"'
 
-# Initialize executor (switch back to WolframScript)
-executor = WolframExecutor(use_kernel=False)
+def _pump_lines(stream, lines: queue.Queue) -> None:
+    """Forward lines from a kernel's stdout to a queue; None marks end of stream"""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+def _drain_chunks(stream, buffer: "_OutputBuffer", chunk_size: int = 65536) -> None:
+    """Read a stream to the end in fixed-size chunks, appending each to buffer
+
+    Chunks rather than lines, so a single very long output line is never held whole.
+    """
+    for chunk in iter(lambda: stream.read(chunk_size), ""):
+        buffer.append(chunk)
+
+class _OutputBuffer:
+    """Collects output text, keeping at most limit characters"""
+    
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.truncated = False
+        self._parts: List[str] = []
+        self._size = 0
+    
+    def append(self, text: str) -> None:
+        if self.limit is not None and self._size + len(text) > self.limit:
+            if not self.truncated:
+                self._parts.append(text[:self.limit - self._size])
+                self._size = self.limit
+                self.truncated = True
+            return
+        self._parts.append(text)
+        self._size += len(text)
+    
+    def getvalue(self) -> str:
+        text = "".join(self._parts)
+        if self.truncated:
+            text += f"\n... [output truncated after {self.limit} characters]"
+        return text
+
+# Code whose value can differ between evaluations: randomness, clocks, I/O,
+# files, memory, fresh symbols, external services, system variables, and
+# anything that assigns, modifies, protects or clears definitions
+_UNCACHEABLE = re.compile(
+    r"(?<![\w$])(Random\w*|Seed\w*|Date\w*|Now|Today|AbsoluteTime|SessionTime|TimeUsed|"
+    r"Timing|AbsoluteTiming|Pause|Print\w*|Import\w*|Export\w*|URL\w*|Get|Put\w*|"
+    r"Read\w*|Write\w*|Run\w*|Clear\w*|Remove|Unset|Set\w*|Needs|Install\w*|"
+    r"AppendTo|PrependTo|AddTo|SubtractFrom|TimesBy|DivideBy|AssociateTo|KeyDropFrom|"
+    r"Protect|Unprotect|\w*File\w*|\w*Directory\w*|MemoryInUse|MaxMemoryUsed|"
+    r"Module|Unique|WolframAlpha|Entity\w*|Interpreter|Cloud\w*|\$\w+)\b"
+    r"|(?<![=!<>])=(?!=)|\+\+|--|<<|>>"
+)
+
+class _Uncached(Exception):
+    """Carries a result out of the cached call without storing it"""
+    
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__(result.get("error"))
+        self.result = result
+
+class WolframKernelPool:
+    """Bounded pool of executors, each with its own persistent kernel
+    
+    Tool calls take an idle executor for the duration of one evaluation, so
+    independent requests run on separate kernels instead of queueing behind one.
+    The most recently used executor is handed out first, so sequential calls
+    reuse one warm kernel and further kernels are only launched under concurrency.
+    
+    Definitions live in the kernel that made them. Code that may change kernel
+    state, and any call made with pinned=True, always runs on the first
+    (primary) executor, which is also the one sequential calls use.
+    
+    Calls made with cache=True (the pure Simplify, Factor, Expand, D, Integrate
+    and Solve wrappers) keep successful results in an LRU cache of cache_size
+    entries, so repeated expressions skip the kernel entirely. Only results
+    from the primary kernel are stored, since another kernel may lack the
+    definitions they depend on. Kernel state persists between calls, so the
+    cache is cleared whenever pinned or state-changing code has run, and
+    whenever the primary kernel is stopped.
+    """
+    
+    def __init__(self, size: int, use_kernel: bool = True, cache_size: int = 1024):
+        self.size = max(1, size)
+        self._executors = [WolframExecutor(use_kernel=use_kernel) for _ in range(self.size)]
+        self._primary = self._executors[0]
+        # Put the primary executor on top, so it is the one handed out first
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        for executor in reversed(self._executors):
+            self._idle.put(executor)
+        self._threads = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="wolfram")
+        self._cached_execute = functools.lru_cache(maxsize=cache_size)(self._execute_or_raise)
+        self._cached_generation = self._primary.generation
+    
+    @property
+    def executable(self) -> str:
+        return self._executors[0].executable
+    
+    def get(self) -> WolframExecutor:
+        """Take an idle executor, blocking until one is free"""
+        return self._idle.get()
+    
+    def put(self, executor: WolframExecutor) -> None:
+        """Return an executor taken with get()"""
+        self._idle.put(executor)
+    
+    def execute(self, code: str, timeout: int = 30, max_output: Optional[int] = None,
+                cache: bool = False, pinned: bool = False) -> Dict[str, Any]:
+        """Run code on the next idle executor, or answer it from the cache (blocking)
+        
+        With cache=True a repeated call may be answered from the cache; use it only
+        for code without side effects. With pinned=True the code always runs on the
+        primary kernel and is treated as state-changing.
+        """
+        if pinned or _UNCACHEABLE.search(code):
+            return self._call_uncached([code], "execute", code, timeout, max_output, pinned=pinned)
+        if not cache:
+            return self._call("execute", code, timeout, max_output)
+        
+        generation = self._primary.generation
+        if generation != self._cached_generation:
+            # The primary kernel was restarted and lost the definitions results may depend on
+            self._cached_execute.cache_clear()
+            self._cached_generation = generation
+        try:
+            return dict(self._cached_execute(code, timeout, max_output))
+        except _Uncached as e:
+            return e.result
+    
+    async def run(self, code: str, timeout: int = 30, max_output: Optional[int] = None,
+                  cache: bool = False, pinned: bool = False) -> Dict[str, Any]:
+        """Run code on the pool's worker threads without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._threads,
+            functools.partial(self.execute, code, timeout, max_output, cache=cache, pinned=pinned)
+        )
+    
+    async def run_many(self, codes: List[str], timeout: int = 30,
+                       max_output: Optional[int] = None) -> Dict[str, Any]:
+        """Run a batch of expressions in one round-trip (see WolframExecutor.execute_many)"""
+        return await self._submit(codes, "execute_many", codes, timeout, max_output)
+    
+    async def run_chain(self, expression: str, operations: List[str], timeout: int = 30,
+                        max_output: Optional[int] = None) -> Dict[str, Any]:
+        """Run a chain of operations in one round-trip (see WolframExecutor.execute_chain)"""
+        return await self._submit(
+            [expression, *operations], "execute_chain", expression, operations, timeout, max_output
+        )
+    
+    def close(self) -> None:
+        """Shut down every kernel in the pool"""
+        for executor in self._executors:
+            executor.close()
+        self._threads.shutdown(wait=False)
+    
+    def _execute_or_raise(self, code: str, timeout: int, max_output: Optional[int]) -> tuple:
+        # Raising keeps transient failures such as timeouts, and results from
+        # kernels other than the primary, out of the cache
+        executor = self.get()
+        try:
+            result = executor.execute(code, timeout, max_output)
+        finally:
+            self.put(executor)
+        if not result["success"] or executor is not self._primary:
+            raise _Uncached(result)
+        return tuple(result.items())
+    
+    def _call(self, method: str, *args, pinned: bool = False) -> Dict[str, Any]:
+        if pinned:
+            # The primary may also be handed out by get(); its lock serializes the two
+            return getattr(self._primary, method)(*args)
+        
+        executor = self.get()
+        try:
+            return getattr(executor, method)(*args)
+        finally:
+            self.put(executor)
+    
+    def _call_uncached(self, codes: List[str], method: str, *args,
+                       pinned: bool = False) -> Dict[str, Any]:
+        stateful = pinned or any(_UNCACHEABLE.search(code) for code in codes)
+        try:
+            return self._call(method, *args, pinned=stateful)
+        finally:
+            # A definition made here changes what cached calls that use it evaluate to
+            if stateful:
+                self._cached_execute.cache_clear()
+    
+    async def _submit(self, codes: List[str], method: str, *args) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, self._call_uncached, codes, method, *args)
+
+def _wrap(op: str, *args: str) -> str:
+    """Build the Wolfram Language call op[arg1, arg2, ...]"""
+    return f"{op}[{', '.join(args)}]"
+
+def _balanced(expr: str, pairs: str = "(){}[]") -> bool:
+    """Check that brackets in expr are balanced and properly nested, ignoring
+    string literals and (possibly nested) (* comments *)"""
+    closers = {pairs[i + 1]: pairs[i] for i in range(0, len(pairs), 2)}
+    openers = set(closers.values())
+    stack = []
+    in_string = escaped = False
+    comment_depth = 0
+    i = 0
+    while i < len(expr):
+        ch, pair = expr[i], expr[i:i + 2]
+        i += 1
+        if comment_depth:
+            if pair in ("(*", "*)"):
+                comment_depth += 1 if pair == "(*" else -1
+                i += 1
+        elif in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif pair == "(*":
+            comment_depth = 1
+            i += 1
+        elif ch == '"':
+            in_string = True
+        elif ch in openers:
+            stack.append(ch)
+        elif ch in closers:
+            if not stack or stack.pop() != closers[ch]:
+                return False
+    return not stack and not in_string and not comment_depth
+
+def _check_balanced(*exprs: str) -> Optional[str]:
+    """Error message for the first argument with unbalanced brackets, or None"""
+    for expr in exprs:
+        if not _balanced(expr):
+            return f"Error: Unbalanced brackets or quotes in {expr!r}"
+    return None
+
+# Operations wolfram_matrix_operations may apply; anything else is rejected
+# before reaching the kernel
+MATRIX_OPERATIONS = frozenset({
+    "Inverse", "Det", "Transpose", "ConjugateTranspose", "Tr", "Diagonal", "Dimensions",
+    "Eigenvalues", "Eigenvectors", "Eigensystem",
+    "MatrixRank", "NullSpace", "RowReduce", "Norm", "MatrixExp", "MatrixLog",
+    "PseudoInverse", "Adjugate", "Minors", "LUDecomposition", "QRDecomposition",
+    "CholeskyDecomposition", "SchurDecomposition", "JordanDecomposition",
+    "SingularValueDecomposition", "SingularValueList"
+})
+_MATRIX_SHAPE = re.compile(r"\s*\{\s*\{.*\}\s*\}\s*", re.DOTALL)
+
+# Wolfram integer and machine real literals (1e5 is a product in Wolfram, so no exponents)
+_INTEGER = re.compile(r"[+-]?\d+")
+_REAL = re.compile(r"[+-]?(\d+\.\d*|\.\d+)")
+# Reals with more significant digits than $MachinePrecision (~15.95) are
+# arbitrary-precision in Wolfram, so they can't be computed as float64
+MACHINE_DIGITS = 15
+
+def _parse_number(token: str) -> Union[int, float]:
+    """Parse a Wolfram integer or machine real literal, raising ValueError for anything else"""
+    token = token.strip()
+    if _INTEGER.fullmatch(token):
+        return int(token)
+    if _REAL.fullmatch(token):
+        digits = token.lstrip("+-").replace(".", "").lstrip("0")
+        if len(digits) > MACHINE_DIGITS:
+            raise ValueError(f"Not a machine real: {token!r}")
+        return float(token)
+    raise ValueError(f"Not a plain number: {token!r}")
+
+def _format_number(value: Union[int, float, Fraction]) -> str:
+    """Format a number the way Wolfram Language prints it in InputForm"""
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return str(value.numerator)
+        return f"{value.numerator}/{value.denominator}"
+    if isinstance(value, (int, np.integer)):
+        return str(value)
+    
+    # InputForm switches to *^ notation from 10^6 up, where repr() still prints digits
+    value = float(value)
+    if abs(value) >= 1e6:
+        mantissa, _, exponent = np.format_float_scientific(value, unique=True).partition("e")
+    else:
+        mantissa, _, exponent = repr(value).partition("e")
+    if mantissa.endswith(".0"):
+        mantissa = mantissa[:-1]
+    elif "." not in mantissa:
+        mantissa += "."
+    return f"{mantissa}*^{int(exponent)}" if exponent else mantissa
+
+def _local_statistics(operation: str, data: str) -> Optional[str]:
+    """
+    Compute common statistics of a plain numeric list without a kernel round-trip
+    
+    Integer data keeps Wolfram's exact semantics (e.g. Mean[{1, 2}] is 3/2); data
+    with machine reals is computed with NumPy. Returns None when the operation or
+    data needs Wolfram Language, such as symbolic entries or StandardDeviation of
+    integers, which is an exact square root.
+    """
+    data = data.strip()
+    if not (data.startswith("{") and data.endswith("}")):
+        return None
+    try:
+        values = [_parse_number(token) for token in data[1:-1].split(",")]
+    except ValueError:
+        return None
+    
+    op = operation.strip()
+    n = len(values)
+    if op == "Max":
+        return _format_number(max(values))
+    if op == "Min":
+        return _format_number(min(values))
+    
+    if all(isinstance(v, int) for v in values):
+        mean = Fraction(sum(values), n)
+        if op == "Mean":
+            return _format_number(mean)
+        if op == "Median":
+            ordered = sorted(values)
+            mid = n // 2
+            median = ordered[mid] if n % 2 else Fraction(ordered[mid - 1] + ordered[mid], 2)
+            return _format_number(median)
+        if op == "Variance" and n > 1:
+            return _format_number(sum((v - mean) ** 2 for v in values) / (n - 1))
+        return None
+    
+    array = np.array(values, dtype=np.float64)
+    if op == "Mean":
+        return _format_number(np.mean(array))
+    if op == "Median":
+        return _format_number(np.median(array))
+    if op == "StandardDeviation" and n > 1:
+        return _format_number(np.std(array, ddof=1))
+    if op == "Variance" and n > 1:
+        return _format_number(np.var(array, ddof=1))
+    return None
+
+def _format_value(value: Union[int, float, complex, Fraction]) -> str:
+    """Format a real or complex number in InputForm"""
+    if isinstance(value, (complex, np.complexfloating)):
+        if value.imag == 0:
+            return _format_number(value.real)
+        sign = "-" if value.imag < 0 else "+"
+        return f"{_format_number(value.real)} {sign} {_format_number(abs(value.imag))}*I"
+    return _format_number(value)
+
+def _format_list(values) -> str:
+    """Format a (possibly nested) list of numbers in InputForm"""
+    if isinstance(values, (list, tuple, np.ndarray)):
+        return "{" + ", ".join(_format_list(v) for v in values) + "}"
+    return _format_value(values)
+
+def _parse_matrix(matrix_data: str) -> Optional[List[List[Union[int, float]]]]:
+    """Parse a literal numeric matrix like {{1, 2}, {3, 4}}; None if it isn't one"""
+    matrix_data = matrix_data.strip()
+    if not (matrix_data.startswith("{{") and matrix_data.endswith("}}")):
+        return None
+    try:
+        rows = [
+            [_parse_number(token) for token in row.split(",")]
+            for row in re.split(r"\}\s*,\s*\{", matrix_data[2:-2])
+        ]
+    except ValueError:
+        return None
+    if any(len(row) != len(rows[0]) for row in rows):
+        return None
+    return rows
+
+def _exact_det(rows: List[List[int]]) -> Fraction:
+    """Determinant by Gaussian elimination over the rationals"""
+    a = [[Fraction(v) for v in row] for row in rows]
+    n = len(a)
+    det = Fraction(1)
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if a[r][col] != 0), None)
+        if pivot is None:
+            return Fraction(0)
+        if pivot != col:
+            a[col], a[pivot] = a[pivot], a[col]
+            det = -det
+        det *= a[col][col]
+        for r in range(col + 1, n):
+            factor = a[r][col] / a[col][col]
+            for c in range(col, n):
+                a[r][c] -= factor * a[col][c]
+    return det
+
+def _exact_inverse(rows: List[List[int]]) -> Optional[List[List[Fraction]]]:
+    """Inverse by Gauss-Jordan elimination over the rationals; None if singular"""
+    n = len(rows)
+    a = [[Fraction(v) for v in row] + [Fraction(int(i == j)) for j in range(n)]
+         for i, row in enumerate(rows)]
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if a[r][col] != 0), None)
+        if pivot is None:
+            return None
+        a[col], a[pivot] = a[pivot], a[col]
+        scale = a[col][col]
+        a[col] = [v / scale for v in a[col]]
+        for r in range(n):
+            if r != col and a[r][col] != 0:
+                factor = a[r][col]
+                a[r] = [v - factor * p for v, p in zip(a[r], a[col])]
+    return [row[n:] for row in a]
+
+def _local_matrix_operation(operation: str, matrix_data: str) -> Optional[str]:
+    """
+    Compute common operations on a literal numeric matrix without a kernel round-trip
+    
+    Integer matrices keep Wolfram's exact results (Inverse gives rationals);
+    matrices with machine reals use np.linalg. Returns None for symbolic entries,
+    singular inverses, exact eigen-decompositions and other operations, which
+    need Wolfram Language.
+    """
+    rows = _parse_matrix(matrix_data)
+    if rows is None:
+        return None
+    
+    op = operation.strip()
+    if op == "Transpose":
+        return _format_list([list(col) for col in zip(*rows)])
+    if len(rows) != len(rows[0]):
+        return None
+    
+    if all(isinstance(v, int) for row in rows for v in row):
+        if op == "Det":
+            return _format_number(_exact_det(rows))
+        if op == "Inverse":
+            inverse = _exact_inverse(rows)
+            return _format_list(inverse) if inverse is not None else None
+        return None
+    
+    matrix = np.array(rows, dtype=np.float64)
+    try:
+        if op == "Det":
+            return _format_number(np.linalg.det(matrix))
+        if op == "Inverse":
+            return _format_list(np.linalg.inv(matrix))
+        if op in ("Eigenvalues", "Eigenvectors"):
+            values, vectors = np.linalg.eig(matrix)
+            # Wolfram orders eigenvalues by decreasing absolute value and
+            # returns eigenvectors as rows
+            order = np.argsort(-np.abs(values), kind="stable")
+            if op == "Eigenvalues":
+                return _format_list(values[order])
+            return _format_list(vectors[:, order].T)
+    except np.linalg.LinAlgError:
+        return None
+    return None
+
+# Initialize the kernel pool (override the size with WOLFRAM_KERNEL_POOL_SIZE).
+# Each kernel takes a license seat, and common licenses allow two.
+KERNEL_POOL_SIZE = int(os.environ.get("WOLFRAM_KERNEL_POOL_SIZE", 2))
+pool = WolframKernelPool(KERNEL_POOL_SIZE, use_kernel=True)
+atexit.register(pool.close)
 
 @mcp.tool()
-def wolfram_calculate(expression: str) -> str:
+async def wolfram_calculate(expression: str) -> str:
     """
     Evaluate a mathematical expression using Wolfram Language.
     
@@ -87,9 +791,12 @@ def wolfram_calculate(expression: str) -> str:
         - "2 + 2"
         - "Integrate[x^2, x]"
         - "Solve[x^2 - 5x + 6 == 0, x]"
-        - "Plot[Sin[x], {x, 0, 2*Pi}]"
     """
-    result = executor.execute(expression)
+    error = _check_balanced(expression)
+    if error:
+        return error
+    
+    result = await pool.run(expression, max_output=MAX_TOOL_OUTPUT)
     
     if result["success"]:
         return f"Result: {result['result']}"
@@ -97,7 +804,7 @@ def wolfram_calculate(expression: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_solve(equation: str, variable: str) -> str:
+async def wolfram_solve(equation: str, variable: str) -> str:
     """
     Solve an equation for a variable using Wolfram Language.
     
@@ -108,8 +815,12 @@ def wolfram_solve(equation: str, variable: str) -> str:
     Example:
         equation="x^2 - 5x + 6 == 0", variable="x"
     """
-    code = f"Solve[{equation}, {variable}]"
-    result = executor.execute(code)
+    error = _check_balanced(equation, variable)
+    if error:
+        return error
+    
+    code = _wrap("Solve", equation, variable)
+    result = await pool.run(code, cache=True)
     
     if result["success"]:
         return f"Solution: {result['result']}"
@@ -117,7 +828,7 @@ def wolfram_solve(equation: str, variable: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_integrate(expression: str, variable: str, limits: Optional[str] = None) -> str:
+async def wolfram_integrate(expression: str, variable: str, limits: Optional[str] = None) -> str:
     """
     Compute integral using Wolfram Language.
     
@@ -130,12 +841,16 @@ def wolfram_integrate(expression: str, variable: str, limits: Optional[str] = No
         - expression="x^2", variable="x" (indefinite)
         - expression="x^2", variable="x", limits="0, 1" (definite)
     """
+    error = _check_balanced(expression, variable, limits or "")
+    if error:
+        return error
+    
     if limits:
-        code = f"Integrate[{expression}, {{{variable}, {limits}}}]"
+        code = _wrap("Integrate", expression, f"{{{variable}, {limits}}}")
     else:
-        code = f"Integrate[{expression}, {variable}]"
+        code = _wrap("Integrate", expression, variable)
     
-    result = executor.execute(code)
+    result = await pool.run(code, cache=True)
     
     if result["success"]:
         return f"Integral: {result['result']}"
@@ -143,7 +858,7 @@ def wolfram_integrate(expression: str, variable: str, limits: Optional[str] = No
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_differentiate(expression: str, variable: str, order: int = 1) -> str:
+async def wolfram_differentiate(expression: str, variable: str, order: int = 1) -> str:
     """
     Compute derivative using Wolfram Language.
     
@@ -155,12 +870,16 @@ def wolfram_differentiate(expression: str, variable: str, order: int = 1) -> str
     Example:
         expression="x^3 + 2x^2 + x", variable="x", order=1
     """
+    error = _check_balanced(expression, variable)
+    if error:
+        return error
+    
     if order == 1:
-        code = f"D[{expression}, {variable}]"
+        code = _wrap("D", expression, variable)
     else:
-        code = f"D[{expression}, {{{variable}, {order}}}]"
+        code = _wrap("D", expression, f"{{{variable}, {order}}}")
     
-    result = executor.execute(code)
+    result = await pool.run(code, cache=True)
     
     if result["success"]:
         return f"Derivative: {result['result']}"
@@ -168,7 +887,7 @@ def wolfram_differentiate(expression: str, variable: str, order: int = 1) -> str
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_simplify(expression: str) -> str:
+async def wolfram_simplify(expression: str) -> str:
     """
     Simplify a mathematical expression using Wolfram Language.
     
@@ -178,8 +897,12 @@ def wolfram_simplify(expression: str) -> str:
     Example:
         expression="(x^2 - 1)/(x - 1)"
     """
-    code = f"Simplify[{expression}]"
-    result = executor.execute(code)
+    error = _check_balanced(expression)
+    if error:
+        return error
+    
+    code = _wrap("Simplify", expression)
+    result = await pool.run(code, max_output=MAX_TOOL_OUTPUT, cache=True)
     
     if result["success"]:
         return f"Simplified: {result['result']}"
@@ -187,7 +910,7 @@ def wolfram_simplify(expression: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_factor(expression: str) -> str:
+async def wolfram_factor(expression: str) -> str:
     """
     Factor a mathematical expression using Wolfram Language.
     
@@ -197,8 +920,12 @@ def wolfram_factor(expression: str) -> str:
     Example:
         expression="x^2 - 5x + 6"
     """
-    code = f"Factor[{expression}]"
-    result = executor.execute(code)
+    error = _check_balanced(expression)
+    if error:
+        return error
+    
+    code = _wrap("Factor", expression)
+    result = await pool.run(code, cache=True)
     
     if result["success"]:
         return f"Factored: {result['result']}"
@@ -206,7 +933,7 @@ def wolfram_factor(expression: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_expand(expression: str) -> str:
+async def wolfram_expand(expression: str) -> str:
     """
     Expand a mathematical expression using Wolfram Language.
     
@@ -216,8 +943,12 @@ def wolfram_expand(expression: str) -> str:
     Example:
         expression="(x + 1)^3"
     """
-    code = f"Expand[{expression}]"
-    result = executor.execute(code)
+    error = _check_balanced(expression)
+    if error:
+        return error
+    
+    code = _wrap("Expand", expression)
+    result = await pool.run(code, cache=True)
     
     if result["success"]:
         return f"Expanded: {result['result']}"
@@ -225,19 +956,28 @@ def wolfram_expand(expression: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_matrix_operations(operation: str, matrix_data: str) -> str:
+async def wolfram_matrix_operations(operation: str, matrix_data: str) -> str:
     """
     Perform matrix operations using Wolfram Language.
     
     Args:
-        operation: Operation to perform (Inverse, Determinant, Eigenvalues, Eigenvectors, etc.)
+        operation: Operation to perform (Inverse, Det, Eigenvalues, Eigenvectors, Transpose, etc.)
         matrix_data: Matrix in Wolfram Language format, e.g., "{{1,2},{3,4}}"
         
     Example:
         operation="Inverse", matrix_data="{{1,2},{3,4}}"
     """
-    code = f"{operation}[{matrix_data}]"
-    result = executor.execute(code)
+    if operation.strip() not in MATRIX_OPERATIONS:
+        return f"Error: Unsupported matrix operation {operation!r}. Supported: {', '.join(sorted(MATRIX_OPERATIONS))}"
+    if not _MATRIX_SHAPE.fullmatch(matrix_data) or not _balanced(matrix_data):
+        return f"Error: Matrix must be a list of rows like {{{{1,2}},{{3,4}}}}, got {matrix_data!r}"
+    
+    local = _local_matrix_operation(operation, matrix_data)
+    if local is not None:
+        return f"Result: {local}"
+    
+    code = _wrap(operation.strip(), matrix_data)
+    result = await pool.run(code)
     
     if result["success"]:
         return f"Result: {result['result']}"
@@ -245,7 +985,7 @@ def wolfram_matrix_operations(operation: str, matrix_data: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_statistics(operation: str, data: str) -> str:
+async def wolfram_statistics(operation: str, data: str) -> str:
     """
     Compute statistical measures using Wolfram Language.
     
@@ -256,8 +996,16 @@ def wolfram_statistics(operation: str, data: str) -> str:
     Example:
         operation="Mean", data="{1, 2, 3, 4, 5}"
     """
-    code = f"{operation}[{data}]"
-    result = executor.execute(code)
+    error = _check_balanced(operation, data)
+    if error:
+        return error
+    
+    local = _local_statistics(operation, data)
+    if local is not None:
+        return f"{operation}: {local}"
+    
+    code = _wrap(operation, data)
+    result = await pool.run(code)
     
     if result["success"]:
         return f"{operation}: {result['result']}"
@@ -265,7 +1013,7 @@ def wolfram_statistics(operation: str, data: str) -> str:
         return f"Error: {result['error']}"
 
 @mcp.tool()
-def wolfram_execute(code: str, timeout: int = 30) -> str:
+async def wolfram_execute(code: str, timeout: int = 30) -> str:
     """
     Execute arbitrary Wolfram Language code.
     Use this for complex calculations or operations not covered by other tools.
@@ -277,7 +1025,8 @@ def wolfram_execute(code: str, timeout: int = 30) -> str:
     Example:
         code="Table[Prime[n], {n, 1, 10}]"
     """
-    result = executor.execute(code, timeout)
+    # Always on the primary kernel, so code relying on earlier definitions sees them
+    result = await pool.run(code, timeout, pinned=True)
     
     if result["success"]:
         return f"Result: {result['result']}\n\nRaw output: {result['raw_output']}"
@@ -290,7 +1039,63 @@ def wolfram_execute(code: str, timeout: int = 30) -> str:
         return error_msg
 
 @mcp.tool()
-def wolfram_test_connection() -> str:
+async def wolfram_batch(expressions: List[str], timeout: int = 30) -> str:
+    """
+    Evaluate several independent Wolfram Language expressions in one call.
+    Cheaper than calling wolfram_calculate repeatedly, since all expressions
+    share a single round-trip to the kernel.
+    
+    Args:
+        expressions: Expressions in Wolfram Language syntax, evaluated in order
+        timeout: Execution timeout in seconds for the whole batch (default 30)
+        
+    Example:
+        expressions=["Solve[x^2 - 4 == 0, x]", "Simplify[(x^2 - 1)/(x - 1)]"]
+    """
+    if not expressions:
+        return "Error: No expressions given"
+    error = _check_balanced(*expressions)
+    if error:
+        return error
+    
+    result = await pool.run_many(expressions, timeout, MAX_TOOL_OUTPUT)
+    
+    if result["success"]:
+        return "\n".join(f"[{i}] {value}" for i, value in enumerate(result["results"], 1))
+    else:
+        return f"Error: {result['error']}"
+
+@mcp.tool()
+async def wolfram_pipeline(expression: str, operations: List[str], timeout: int = 30) -> str:
+    """
+    Apply a chain of operations to an expression in one call, returning the
+    result after each step. Each operation receives the previous step's result.
+    
+    Args:
+        expression: Starting expression in Wolfram Language syntax
+        operations: Function names or pure functions, e.g. "Simplify" or "Solve[# == 0, x] &"
+        timeout: Execution timeout in seconds for the whole chain (default 30)
+        
+    Example:
+        expression="(x^2 - 1)/(x - 1) - 3", operations=["Simplify", "Solve[# == 0, x] &"]
+    """
+    if not operations:
+        return "Error: No operations given"
+    error = _check_balanced(expression, *operations)
+    if error:
+        return error
+    
+    result = await pool.run_chain(expression, operations, timeout, MAX_TOOL_OUTPUT)
+    
+    if result["success"]:
+        return "\n".join(
+            f"{operation}: {value}" for operation, value in zip(operations, result["results"])
+        )
+    else:
+        return f"Error: {result['error']}"
+
+@mcp.tool()
+async def wolfram_test_connection() -> str:
     """
     Test the connection to Wolfram Language/Mathematica.
     Returns version information and confirms the system is working.
@@ -303,12 +1108,12 @@ def wolfram_test_connection() -> str:
   "Test" -> 2 + 2
 }
 """
-    result = executor.execute(test_code)
+    result = await pool.run(test_code)
     
     if result["success"]:
-        return f"✓ Wolfram Language Connected\n\nResult: {result['result']}\n\nExecutable: {executor.executable}"
+        return f"✓ Wolfram Language Connected\n\nResult: {result['result']}\n\nExecutable: {pool.executable}"
     else:
-        return f"✗ Connection Failed\n\nError: {result.get('error', 'Unknown error')}\n\nExecutable: {executor.executable}\n\nPlease ensure Wolfram Language/Mathematica is properly installed and licensed."
+        return f"✗ Connection Failed\n\nError: {result.get('error', 'Unknown error')}\n\nExecutable: {pool.executable}\n\nPlease ensure Wolfram Language/Mathematica is properly installed and licensed."
 
 if __name__ == "__main__":
     mcp.run()